@@ -11,17 +11,357 @@ import cv2
 import numpy as np
 import threading
 import queue
+import base64
+import bisect
 import json
 import os
+import subprocess
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from PIL import Image, ImageTk
+from dataclasses import dataclass, field, replace
 import logging
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False  # alpha overlays blend with numpy instead
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Decode acceleration modes offered in the Import tab. "CUDA" has no OpenCV
+# acceleration enum of its own; it decodes through FFmpeg's cuvid (NVDEC) decoders.
+HW_DECODE_MODES = {
+    "Auto": cv2.VIDEO_ACCELERATION_ANY,
+    "CUDA": cv2.VIDEO_ACCELERATION_NONE,
+    "VAAPI": cv2.VIDEO_ACCELERATION_VAAPI,
+    "D3D11": cv2.VIDEO_ACCELERATION_D3D11,
+    "MFX": cv2.VIDEO_ACCELERATION_MFX,
+    "None": cv2.VIDEO_ACCELERATION_NONE,
+}
+
+# FourCC reported by the FFmpeg backend -> matching NVDEC decoder
+CUVID_DECODERS = {
+    'h264': 'h264_cuvid', 'avc1': 'h264_cuvid',
+    'hevc': 'hevc_cuvid', 'hev1': 'hevc_cuvid', 'hvc1': 'hevc_cuvid',
+    'vp90': 'vp9_cuvid', 'vp09': 'vp9_cuvid',
+    'av01': 'av1_cuvid',
+}
+
+# Largest kernel cv2.cuda's separable Gaussian filter accepts
+CUDA_MAX_FILTER_KSIZE = 31
+
+# Blur kernels at least this wide use cv2.stackBlur (or repeated box filters),
+# whose per-pixel cost does not grow with the kernel size
+STACK_BLUR_MIN_KSIZE = 15
+
+# From this size up to STACK_BLUR_MIN_KSIZE, a separable filter with a cached
+# kernel beats GaussianBlur, which rebuilds its kernel on every call
+SEP_FILTER_MIN_KSIZE = 7
+HAS_STACK_BLUR = hasattr(cv2, 'stackBlur')  # OpenCV >= 4.7
+
+# Forward jumps up to this many frames are decoded through instead of seeking,
+# since a seek restarts decoding from the previous keyframe
+MAX_GRAB_AHEAD = 30
+
+# Decoded frames kept for scrubbing back and forth over the same stretch
+FRAME_CACHE_SIZE = 64
+
+# Track features are detected on a half-size frame from this width up, then
+# refined to sub-pixel accuracy on the full one
+DETECT_DOWNSCALE_MIN_WIDTH = 960
+
+# ffmpeg encoders offered in the Export tab: quality flag taking the
+# Quality slider value, and encoder-specific output options
+EXPORT_ENCODERS = {
+    "libx264": ("-crf", ["-preset", "medium", "-pix_fmt", "yuv420p"]),
+    "h264_nvenc": ("-cq", ["-preset", "p4", "-pix_fmt", "yuv420p"]),
+    "hevc_nvenc": ("-cq", ["-preset", "p4", "-pix_fmt", "yuv420p"]),
+    "h264_vaapi": ("-qp", ["-vf", "format=nv12,hwupload"]),
+    "h264_qsv": ("-global_quality", ["-pix_fmt", "nv12"]),
+}
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# Encoders tried, in order, for the Auto choice: hardware first, libx264 last
+AUTO_ENCODER_ORDER = ("h264_nvenc", "h264_qsv", "h264_vaapi", "libx264")
+
+# Frames buffered between the decode, effects and encode stages of an export
+EXPORT_QUEUE_SIZE = 8
+
+# Export progress is posted to Tk at most this often (seconds), so workers
+# don't flood the Tk event queue
+EXPORT_PROGRESS_INTERVAL = 1 / 30
+
+# Image sequences trade a little file size for much faster PNG encoding
+SEQUENCE_PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+# Processed frames waiting to be encoded during a sequence export; bounds its memory use
+SEQUENCE_WRITES_IN_FLIGHT = 8
+
+def available_backends():
+    """Effect processing backends usable with this OpenCV build"""
+    backends = ["CPU"]
+    if cv2.ocl.haveOpenCL():
+        backends.append("OpenCL")
+    try:
+        if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+            backends.append("CUDA")
+    except (AttributeError, cv2.error):
+        pass  # OpenCV built without the cuda module
+    return backends
+
+def tune_thread_count(width, height, iterations=30, budget=0.05):
+    """Set cv2.setNumThreads to the count that blurs a width x height frame fastest
+    
+    Full-frame filters are often memory-bound, where extra threads only add
+    contention, so the count is measured rather than assumed to be all cores.
+    Each candidate gets at most iterations blurs or budget seconds.
+    """
+    frame = np.zeros((height, width, 3), np.uint8)
+    dst = np.empty_like(frame)
+    cpus = os.cpu_count() or 1
+    
+    best, best_rate = cv2.getNumThreads(), 0.0
+    for n in sorted({min(n, cpus) for n in (1, 2, 4, cpus)}):
+        cv2.setNumThreads(n)
+        cv2.GaussianBlur(frame, (5, 5), 1.0, dst=dst)  # spin up the thread pool
+        
+        start = time.perf_counter()
+        done = 0
+        while done < iterations and time.perf_counter() - start < budget:
+            cv2.GaussianBlur(frame, (5, 5), 1.0, dst=dst)
+            done += 1
+        rate = done / (time.perf_counter() - start)
+        if rate > best_rate:
+            best, best_rate = n, rate
+    
+    cv2.setNumThreads(best)
+    return best
+
+def write_png(path, image):
+    """cv2.imwrite with the sequence PNG settings, raising instead of returning False"""
+    if not cv2.imwrite(path, image, SEQUENCE_PNG_PARAMS):
+        raise IOError(f"Could not write {path}")
+
+def ffmpeg_encoders():
+    """Names of the video encoders the ffmpeg on PATH was built with, None without ffmpeg"""
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"],
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    # Lines look like " V....D libx264   libx264 H.264 / AVC ..."
+    return {line.split()[1] for line in result.stdout.splitlines()
+            if line.startswith(" V") and len(line.split()) > 1}
+
+def ffmpeg_encode_command(encoder, quality, fps, width, height, output):
+    """ffmpeg command encoding raw BGR frames from stdin with encoder; output is the trailing args"""
+    quality_flag, options = EXPORT_ENCODERS[encoder]
+    cmd = ["ffmpeg", "-y", "-v", "error"]
+    if encoder.endswith("_vaapi"):
+        cmd += ["-vaapi_device", VAAPI_DEVICE]
+    cmd += ["-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}",
+            "-r", str(fps), "-i", "-",
+            "-c:v", encoder, *options, quality_flag, str(quality), *output]
+    return cmd
+
+@lru_cache(maxsize=None)
+def encoder_works(encoder):
+    """Whether a short test encode with encoder succeeds on this machine"""
+    # ffmpeg lists NVENC/QSV/VAAPI whenever it was built with them, whether
+    # or not there is hardware (or a driver) to run them on
+    width, height, frames = 256, 256, 5
+    cmd = ffmpeg_encode_command(encoder, 23, 30, width, height, ["-f", "null", "-"])
+    try:
+        result = subprocess.run(cmd, input=bytes(width * height * 3 * frames),
+                                capture_output=True, timeout=15)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    if result.returncode != 0:
+        logger.info(f"{encoder} unavailable: {result.stderr.decode(errors='replace').strip()}")
+    return result.returncode == 0
+
+def pick_export_encoder():
+    """First working encoder in AUTO_ENCODER_ORDER, None without a usable ffmpeg"""
+    encoders = ffmpeg_encoders()
+    if encoders is None:
+        return None
+    for encoder in AUTO_ENCODER_ORDER:
+        if encoder in encoders and encoder_works(encoder):
+            return encoder
+    return None
+
+def blur_kernel_size(ksize, sigma):
+    """Odd Gaussian kernel size, trimmed to the part of the kernel with real weight"""
+    # Taps beyond 3 sigma carry under 0.3% of the total weight
+    ksize = max(1, min(int(ksize), 2 * int(np.ceil(3 * sigma)) + 1))
+    return ksize if ksize % 2 else ksize + 1
+
+def normalize_overlay(image):
+    """image as 8-bit BGR, or BGRA if it has alpha, whatever depth it was loaded with"""
+    # Blending then runs on matching uint8 data with no per-frame conversion
+    if image.dtype == np.uint16:
+        image = cv2.convertScaleAbs(image, alpha=1 / 257)
+    elif image.dtype != np.uint8:
+        image = cv2.convertScaleAbs(image, alpha=255)  # float images are 0..1
+    
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 2:
+        gray, alpha = cv2.split(image)
+        return cv2.merge([gray, gray, gray, alpha])
+    return image
+
+def aligned_copy(array, align=32):
+    """C-contiguous copy of array whose data starts on an align-byte boundary"""
+    # numpy only guarantees 16-byte alignment; 32 keeps AVX2 loads in the
+    # blend kernels aligned on every row of a cached matte
+    buf = np.empty(array.nbytes + align, np.uint8)
+    offset = -buf.ctypes.data % align
+    aligned = buf[offset:offset + array.nbytes].view(array.dtype).reshape(array.shape)
+    np.copyto(aligned, array)
+    return aligned
+
+def compose_lut(lut, passes):
+    """Lookup table equivalent to applying lut passes times"""
+    # Repeated adjustments compose exactly into one 256-entry table
+    composed = lut
+    for _ in range(passes - 1):
+        composed = lut[composed]
+    return composed
+
+@lru_cache(maxsize=32)
+def gaussian_kernel(ksize, sigma):
+    """1-D Gaussian kernel, built once per (ksize, sigma)"""
+    return cv2.getGaussianKernel(ksize, sigma)
+
+# CPU effect steps. Out-of-place steps take (src, dst, *args) and return the
+# result, which is dst; in-place steps take (img, *args). The args are bound
+# from EffectParams when the pipeline is compiled, see _pipeline_runner.
+
+# Intermediate single-channel buffers, per thread since the preview and
+# export pipelines run concurrently
+_step_buffers = threading.local()
+
+def _step_buffer(name, shape):
+    """Per-thread uint8 buffer of the given shape, reused across frames"""
+    buf = getattr(_step_buffers, name, None)
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, np.uint8)
+        setattr(_step_buffers, name, buf)
+    return buf
+
+def _apply_copy(src, dst):
+    """Copy src into dst"""
+    np.copyto(dst, src)
+    return dst
+
+def _apply_canny(src, dst, low, high):
+    """Canny edges of src, expanded back to BGR in dst"""
+    if not isinstance(src, np.ndarray):
+        # OpenCL hands in UMats, which manage their own device buffers
+        edges = cv2.Canny(cv2.cvtColor(src, cv2.COLOR_BGR2GRAY), low, high)
+        return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+    gray = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY, dst=_step_buffer('gray', src.shape[:2]))
+    edges = cv2.Canny(gray, low, high, edges=_step_buffer('edges', src.shape[:2]))
+    return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR, dst=dst)
+
+def _apply_blur(src, dst, ksize, sigma):
+    """Gaussian blur src into dst"""
+    if ksize < SEP_FILTER_MIN_KSIZE:
+        return cv2.GaussianBlur(src, (ksize, ksize), sigma, dst=dst)
+    if ksize < STACK_BLUR_MIN_KSIZE:
+        kernel = gaussian_kernel(ksize, sigma)
+        return cv2.sepFilter2D(src, -1, kernel, kernel, dst=dst)
+    if HAS_STACK_BLUR:
+        return cv2.stackBlur(src, (ksize, ksize), dst=dst)
+    
+    # Three box passes approximate a Gaussian of the same overall width
+    box = ((ksize // 3) | 1,) * 2
+    blurred = cv2.boxFilter(src, -1, box, dst=dst)
+    for _ in range(2):
+        blurred = cv2.boxFilter(blurred, -1, box, dst=blurred)
+    return blurred
+
+def _apply_color(src, dst, lut):
+    """Brightness/contrast adjustment through a 256-entry lookup table"""
+    return cv2.LUT(src, lut, dst=dst)
+
+def _apply_text(img, text, org, scale, thickness):
+    """Draw the text overlay onto img in place"""
+    cv2.putText(img, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), thickness)
+
+if HAS_NUMBA:
+    # Serial on purpose: preview, playback and the export pool call this
+    # concurrently, which numba's fallback workqueue threading layer aborts on
+    @njit(cache=True)
+    def _blend_premultiplied(dst, src, inv):
+        """dst = (dst * inv + src) >> 8 in place; see _overlay_matte"""
+        for i in range(dst.shape[0]):
+            for j in range(dst.shape[1]):
+                for c in range(3):
+                    dst[i, j, c] = (dst[i, j, c] * inv[i, j, c] + src[i, j, c]) >> 8
+
+@dataclass(frozen=True)
+class EffectParams:
+    """Snapshot of the effect controls, taken on the Tk thread whenever they change.
+    
+    The per-frame pipeline reads these plain values instead of calling
+    Tk Variable.get(), which round-trips into Tcl and is not thread-safe.
+    """
+    canny_low: int = 50
+    canny_high: int = 150
+    blur_ksize: int = 5  # always odd, see blur_kernel_size
+    blur_sigma: float = 1.0
+    brightness: float = 0.0
+    contrast: float = 1.0
+    # 256-entry table equivalent to convertScaleAbs(alpha=contrast, beta=brightness)
+    color_lut: np.ndarray = field(default_factory=lambda: np.arange(256, dtype=np.uint8),
+                                  compare=False, repr=False)
+    text: str = "Sample Text"
+    text_scale: float = 0.6
+    text_x: int = 50
+    text_y: int = 50
+    text_thickness: int = 2
+    overlay_x: int = 10
+    overlay_y: int = 10
+    overlay_opacity: float = 1.0
+    overlay_scale: float = 1.0
+    crop_enabled: bool = False
+    crop_x: int = 0
+    crop_y: int = 0
+    crop_w: int = 640
+    crop_h: int = 480
+
+class FFmpegWriter:
+    """Pipes BGR frames to an ffmpeg encoder; write()/release() like cv2.VideoWriter"""
+    
+    def __init__(self, output_path, encoder, quality, fps, width, height):
+        # 4:2:0 encoders need even dimensions, so drop an odd last row/column
+        self.width, self.height = width & ~1, height & ~1
+        cmd = ffmpeg_encode_command(encoder, quality, fps, self.width, self.height, [output_path])
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    
+    def write(self, frame):
+        """Send one frame to the encoder"""
+        frame = np.ascontiguousarray(frame[:self.height, :self.width])
+        try:
+            self.proc.stdin.write(frame.data)
+        except BrokenPipeError:
+            self.release()  # raises with ffmpeg's error message
+            raise
+    
+    def release(self):
+        """Finish encoding; raises RuntimeError if ffmpeg failed"""
+        _, stderr = self.proc.communicate()
+        if self.proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+
 class VideoLabPro:
     def __init__(self):
         self.root = tk.Tk()
@@ -30,17 +370,34 @@ class VideoLabPro:
         
         # Core state
         self.video_cap = None
+        self.video_path = None
         self.current_frame = None
         self.processed_frame = None
         self.frame_count = 0
         self.fps = 30
         self.current_frame_idx = 0
+        self._next_read_idx = None  # frame the capture returns on the next read()
+        self._keyframes = np.empty(0, np.int64)  # sorted keyframe indices, filled in the background
+        self._frame_cache = OrderedDict()  # frame idx -> decoded frame, least recently used first
         self.is_playing = False
+        self._preview_pending = None  # Tk after() id of a coalesced redraw
         self.preview_scale = 0.5
+        self._proxy_source = None  # current_frame that _proxy_frame was made from
+        self._proxy_frame = None
+        self._proxy_scale = None  # preview scale _proxy_frame was made at
+        self._scaled_params_cache = None
+        self._crop_params_cache = {}  # scale -> (params, crop origin, params relative to the crop)
         
         # Pipeline and effects
         self.effects_pipeline = []
+        self.params = EffectParams()
+        self._compiled_pipeline = ("CPU", [])
+        self._bound_pipelines = {}  # scale -> (compiled pipeline, params, runner)
+        self._scratch = threading.local()
+        self._cuda_filters = threading.local()  # CUDA filters keep internal work buffers, so each thread gets its own
         self.overlay_image = None
+        self._overlay_cache = {}  # (scale, opacity) -> matte, see _overlay_matte
+        self._overlay_resized = {}  # (scale, overlay shape) -> resized overlay
         self.overlay_params = {'x': 10, 'y': 10, 'opacity': 1.0, 'scale': 1.0}
         self.crop_params = {'x': 0, 'y': 0, 'w': 0, 'h': 0, 'enabled': False}
         
@@ -49,17 +406,35 @@ class VideoLabPro:
         self.track_points = []
         self.lk_params = dict(winSize=(15,15), maxLevel=2, criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
         self.feature_params = dict(maxCorners=100, qualityLevel=0.3, minDistance=7, blockSize=7)
+        self._track_gray = None  # grayscale of the frame track_points belong to
+        self._track_frame_idx = None
+        self._gray_bufs = []  # two preallocated gray frames, swapped per tracked frame
         
-        # Threading
+        # Threading: the decoder thread prefetches into frame_queue for the
+        # preview thread. Seeks bump _seek_generation to invalidate queued frames.
         self.frame_queue = queue.Queue(maxsize=30)
+        self.decode_thread = None
         self.preview_thread = None
         self.stop_preview = False
+        self._cap_lock = threading.Lock()
+        self._seek_generation = 0
+        self._playback_clock = None  # (generation, monotonic start time, start frame idx) of the running playback
+        # Still-frame redraws run on their own worker; only the latest request is kept
+        self._preview_requests = queue.Queue(maxsize=1)
+        threading.Thread(target=self._preview_worker, daemon=True).start()
         
         # Project data
         self.project_path = None
-        self.markers = []
+        self.markers = []  # (frame, name), kept sorted
+        
+        # Make sure OpenCV's SIMD dispatch and OpenCL are active
+        cv2.setUseOptimized(True)
+        if cv2.ocl.haveOpenCL():
+            cv2.ocl.setUseOpenCL(True)
         
         self.setup_ui()
+        self._compile_pipeline()
+        self._tune_threads(1280, 720)  # retuned for the real frame size on open
         
     def setup_ui(self):
         """Setup the multi-tab UI"""
@@ -77,9 +452,13 @@ class VideoLabPro:
         self.setup_export_tab()
         
         # Status bar
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
         self.status_var = tk.StringVar(value="Ready")
-        self.status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_bar = ttk.Label(status_frame, textvariable=self.status_var, relief=tk.SUNKEN)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.threads_var = tk.StringVar()
+        ttk.Label(status_frame, textvariable=self.threads_var, relief=tk.SUNKEN).pack(side=tk.RIGHT)
         
         # Bind keyboard shortcuts
         self.root.bind('<space>', lambda e: self.toggle_playback())
@@ -102,6 +481,11 @@ class VideoLabPro:
         ttk.Button(file_frame, text="Save Project", command=self.save_project).pack(side=tk.LEFT, padx=5)
         ttk.Button(file_frame, text="Load Project", command=self.load_project).pack(side=tk.LEFT, padx=5)
         
+        self.decode_mode = tk.StringVar(value="Auto")
+        ttk.Label(file_frame, text="Decode:").pack(side=tk.LEFT, padx=(20, 2))
+        ttk.Combobox(file_frame, textvariable=self.decode_mode, values=list(HW_DECODE_MODES),
+                     state="readonly", width=8).pack(side=tk.LEFT, padx=2)
+        
         # Preview area
         preview_frame = ttk.LabelFrame(tab, text="Preview")
         preview_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -109,6 +493,12 @@ class VideoLabPro:
         self.preview_label = ttk.Label(preview_frame, text="No video loaded")
         self.preview_label.pack(expand=True)
         
+        # Reused for every preview frame; attached to the label on first display
+        self._display_img = tk.PhotoImage()
+        self._ppm_buf = None  # PPM header + RGB pixels of the last displayed size
+        self._ppm_rgb = None  # pixel area of _ppm_buf as an HxWx3 array
+        self._ppm_base64 = False  # Tk builds that reject binary image data get base64
+        
         # Controls
         controls_frame = ttk.Frame(preview_frame)
         controls_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -121,6 +511,13 @@ class VideoLabPro:
         ttk.Button(controls_frame, text=">", command=lambda: self.step_frame(1)).pack(side=tk.LEFT, padx=2)
         ttk.Button(controls_frame, text=">>", command=lambda: self.step_frame(10)).pack(side=tk.LEFT, padx=2)
         
+        self.preview_scale_var = tk.StringVar(value="50%")
+        ttk.Label(controls_frame, text="Preview:").pack(side=tk.LEFT, padx=(15, 2))
+        scale_combo = ttk.Combobox(controls_frame, textvariable=self.preview_scale_var,
+                                   values=["25%", "50%", "100%"], state="readonly", width=5)
+        scale_combo.pack(side=tk.LEFT, padx=2)
+        scale_combo.bind('<<ComboboxSelected>>', self._on_preview_scale_change)
+        
         # Frame info
         self.frame_info_var = tk.StringVar(value="Frame: 0/0 | FPS: 0 | Time: 00:00:00")
         ttk.Label(controls_frame, textvariable=self.frame_info_var).pack(side=tk.RIGHT, padx=5)
@@ -150,6 +547,13 @@ class VideoLabPro:
         ttk.Button(list_controls, text="Remove", command=self.remove_effect).pack(fill=tk.X, pady=2)
         ttk.Button(list_controls, text="Clear All", command=self.clear_effects).pack(fill=tk.X, pady=2)
         
+        self.processing_backend = tk.StringVar(value="CPU")
+        ttk.Label(list_controls, text="Processing:").pack(fill=tk.X, pady=(10, 0))
+        backend_combo = ttk.Combobox(list_controls, textvariable=self.processing_backend,
+                                     values=available_backends(), state="readonly", width=8)
+        backend_combo.pack(fill=tk.X, pady=2)
+        backend_combo.bind('<<ComboboxSelected>>', self._on_backend_change)
+        
         # Effect controls
         controls_frame = ttk.LabelFrame(tab, text="Effect Controls")
         controls_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -162,11 +566,11 @@ class VideoLabPro:
         self.canny_high = tk.DoubleVar(value=150)
         
         ttk.Label(edge_frame, text="Canny Low:").grid(row=0, column=0, sticky="w")
-        ttk.Scale(edge_frame, from_=0, to=255, variable=self.canny_low, orient=tk.HORIZONTAL, command=self.update_preview).grid(row=0, column=1, sticky="ew")
+        ttk.Scale(edge_frame, from_=0, to=255, variable=self.canny_low, orient=tk.HORIZONTAL, command=self._sync_params).grid(row=0, column=1, sticky="ew")
         ttk.Label(edge_frame, textvariable=self.canny_low).grid(row=0, column=2)
         
         ttk.Label(edge_frame, text="Canny High:").grid(row=1, column=0, sticky="w")
-        ttk.Scale(edge_frame, from_=0, to=255, variable=self.canny_high, orient=tk.HORIZONTAL, command=self.update_preview).grid(row=1, column=1, sticky="ew")
+        ttk.Scale(edge_frame, from_=0, to=255, variable=self.canny_high, orient=tk.HORIZONTAL, command=self._sync_params).grid(row=1, column=1, sticky="ew")
         ttk.Label(edge_frame, textvariable=self.canny_high).grid(row=1, column=2)
         
         ttk.Button(edge_frame, text="Add Canny Edge", command=lambda: self.add_effect("canny")).grid(row=2, column=0, columnspan=3, pady=5)
@@ -179,11 +583,11 @@ class VideoLabPro:
         self.blur_sigma = tk.DoubleVar(value=1.0)
         
         ttk.Label(blur_frame, text="Kernel Size:").grid(row=0, column=0, sticky="w")
-        ttk.Scale(blur_frame, from_=1, to=51, variable=self.blur_kernel, orient=tk.HORIZONTAL, command=self.update_preview).grid(row=0, column=1, sticky="ew")
+        ttk.Scale(blur_frame, from_=1, to=51, variable=self.blur_kernel, orient=tk.HORIZONTAL, command=self._sync_params).grid(row=0, column=1, sticky="ew")
         ttk.Label(blur_frame, textvariable=self.blur_kernel).grid(row=0, column=2)
         
         ttk.Label(blur_frame, text="Sigma:").grid(row=1, column=0, sticky="w")
-        ttk.Scale(blur_frame, from_=0.1, to=10.0, variable=self.blur_sigma, orient=tk.HORIZONTAL, command=self.update_preview).grid(row=1, column=1, sticky="ew")
+        ttk.Scale(blur_frame, from_=0.1, to=10.0, variable=self.blur_sigma, orient=tk.HORIZONTAL, command=self._sync_params).grid(row=1, column=1, sticky="ew")
         ttk.Label(blur_frame, textvariable=self.blur_sigma).grid(row=1, column=2)
         
         ttk.Button(blur_frame, text="Add Gaussian Blur", command=lambda: self.add_effect("gaussian_blur")).grid(row=2, column=0, columnspan=3, pady=5)
@@ -197,11 +601,11 @@ class VideoLabPro:
         self.saturation = tk.DoubleVar(value=1.0)
         
         ttk.Label(color_frame, text="Brightness:").grid(row=0, column=0, sticky="w")
-        ttk.Scale(color_frame, from_=-100, to=100, variable=self.brightness, orient=tk.HORIZONTAL, command=self.update_preview).grid(row=0, column=1, sticky="ew")
+        ttk.Scale(color_frame, from_=-100, to=100, variable=self.brightness, orient=tk.HORIZONTAL, command=self._sync_params).grid(row=0, column=1, sticky="ew")
         ttk.Label(color_frame, textvariable=self.brightness).grid(row=0, column=2)
         
         ttk.Label(color_frame, text="Contrast:").grid(row=0, column=3, sticky="w")
-        ttk.Scale(color_frame, from_=0.0, to=3.0, variable=self.contrast, orient=tk.HORIZONTAL, command=self.update_preview).grid(row=0, column=4, sticky="ew")
+        ttk.Scale(color_frame, from_=0.0, to=3.0, variable=self.contrast, orient=tk.HORIZONTAL, command=self._sync_params).grid(row=0, column=4, sticky="ew")
         ttk.Label(color_frame, textvariable=self.contrast).grid(row=0, column=5)
         
         ttk.Button(color_frame, text="Add Color Adjust", command=lambda: self.add_effect("color_adjust")).grid(row=1, column=0, columnspan=6, pady=5)
@@ -262,9 +666,10 @@ class VideoLabPro:
         
         ttk.Label(text_frame, text="Text:").grid(row=0, column=0, sticky="w")
         ttk.Entry(text_frame, textvariable=self.text_content, width=30).grid(row=0, column=1, sticky="ew", padx=5)
+        self.text_content.trace_add('write', self._sync_params)
         
         ttk.Label(text_frame, text="Font Size:").grid(row=1, column=0, sticky="w")
-        ttk.Scale(text_frame, from_=10, to=200, variable=self.text_size, orient=tk.HORIZONTAL, command=self.update_preview).grid(row=1, column=1, sticky="ew")
+        ttk.Scale(text_frame, from_=10, to=200, variable=self.text_size, orient=tk.HORIZONTAL, command=self._sync_params).grid(row=1, column=1, sticky="ew")
         
         ttk.Button(text_frame, text="Add Text Overlay", command=lambda: self.add_effect("text")).grid(row=2, column=0, columnspan=2, pady=5)
         
@@ -334,6 +739,7 @@ class VideoLabPro:
         self.max_corners = tk.IntVar(value=100)
         self.quality_level = tk.DoubleVar(value=0.3)
         self.min_distance = tk.IntVar(value=7)
+        self.fast_detector = tk.BooleanVar(value=False)
         
         ttk.Label(params_frame, text="Max Corners:").grid(row=0, column=0, sticky="w")
         ttk.Scale(params_frame, from_=10, to=500, variable=self.max_corners, orient=tk.HORIZONTAL).grid(row=0, column=1, sticky="ew")
@@ -343,6 +749,9 @@ class VideoLabPro:
         ttk.Scale(params_frame, from_=0.01, to=1.0, variable=self.quality_level, orient=tk.HORIZONTAL).grid(row=1, column=1, sticky="ew")
         ttk.Label(params_frame, textvariable=self.quality_level).grid(row=1, column=2)
         
+        ttk.Checkbutton(params_frame, text="FAST detector (quicker on large frames)",
+                        variable=self.fast_detector).grid(row=2, column=0, columnspan=3, sticky="w")
+        
         params_frame.grid_columnconfigure(1, weight=1)
         
         # Tracking info
@@ -401,6 +810,7 @@ class VideoLabPro:
         settings_frame.pack(fill=tk.X, padx=5, pady=5)
         
         self.export_format = tk.StringVar(value="mp4")
+        self.export_encoder = tk.StringVar(value="Auto")
         self.export_quality = tk.IntVar(value=23)
         self.export_fps = tk.DoubleVar(value=30)
         
@@ -408,13 +818,17 @@ class VideoLabPro:
         format_combo = ttk.Combobox(settings_frame, textvariable=self.export_format, values=["mp4", "avi", "mov"])
         format_combo.grid(row=0, column=1, sticky="ew", padx=5)
         
-        ttk.Label(settings_frame, text="Quality (CRF):").grid(row=1, column=0, sticky="w")
-        ttk.Scale(settings_frame, from_=0, to=51, variable=self.export_quality, orient=tk.HORIZONTAL).grid(row=1, column=1, sticky="ew")
-        ttk.Label(settings_frame, textvariable=self.export_quality).grid(row=1, column=2)
+        ttk.Label(settings_frame, text="Encoder:").grid(row=1, column=0, sticky="w")
+        ttk.Combobox(settings_frame, textvariable=self.export_encoder, values=["Auto", *EXPORT_ENCODERS],
+                     state="readonly").grid(row=1, column=1, sticky="ew", padx=5)
+        
+        ttk.Label(settings_frame, text="Quality (CRF):").grid(row=2, column=0, sticky="w")
+        ttk.Scale(settings_frame, from_=0, to=51, variable=self.export_quality, orient=tk.HORIZONTAL).grid(row=2, column=1, sticky="ew")
+        ttk.Label(settings_frame, textvariable=self.export_quality).grid(row=2, column=2)
         
-        ttk.Label(settings_frame, text="FPS:").grid(row=2, column=0, sticky="w")
-        ttk.Scale(settings_frame, from_=1, to=60, variable=self.export_fps, orient=tk.HORIZONTAL).grid(row=2, column=1, sticky="ew")
-        ttk.Label(settings_frame, textvariable=self.export_fps).grid(row=2, column=2)
+        ttk.Label(settings_frame, text="FPS:").grid(row=3, column=0, sticky="w")
+        ttk.Scale(settings_frame, from_=1, to=60, variable=self.export_fps, orient=tk.HORIZONTAL).grid(row=3, column=1, sticky="ew")
+        ttk.Label(settings_frame, textvariable=self.export_fps).grid(row=3, column=2)
         
         settings_frame.grid_columnconfigure(1, weight=1)
         
@@ -450,30 +864,118 @@ class VideoLabPro:
                 if self.video_cap:
                     self.video_cap.release()
                 
-                self.video_cap = cv2.VideoCapture(file_path)
+                self.video_cap, frame, decode_mode = self._open_capture(file_path)
+                self.video_path = file_path
                 self.frame_count = int(self.video_cap.get(cv2.CAP_PROP_FRAME_COUNT))
                 self.fps = self.video_cap.get(cv2.CAP_PROP_FPS)
                 
+                self._frame_cache.clear()
+                self._keyframes = np.empty(0, np.int64)
+                threading.Thread(target=self._index_keyframes, args=(file_path, self.fps),
+                                 daemon=True).start()
+                
                 # Update timeline
                 self.timeline_scale.configure(to=self.frame_count-1)
                 
                 # Load first frame
                 self.current_frame_idx = 0
-                self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                ret, frame = self.video_cap.read()
-                if ret:
+                self._next_read_idx = 1 if frame is not None else None
+                if frame is not None:
+                    # Tune before posting the first preview, so the benchmark
+                    # doesn't compete with the preview worker
+                    self._tune_threads(frame.shape[1], frame.shape[0])
                     self.current_frame = frame
                     self.update_preview_display()
                 
                 # Update metadata
                 self.update_metadata()
-                self.status_var.set(f"Loaded: {Path(file_path).name}")
-                logger.info(f"Loaded video: {file_path}")
+                self.status_var.set(f"Loaded: {Path(file_path).name} (decode: {decode_mode})")
+                logger.info(f"Loaded video: {file_path} (decode: {decode_mode})")
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load video: {str(e)}")
                 logger.error(f"Failed to load video: {e}")
     
+    def _open_capture(self, file_path):
+        """Open a capture with the selected hardware decoder, falling back to software"""
+        mode = self.decode_mode.get()
+        accel = HW_DECODE_MODES.get(mode, cv2.VIDEO_ACCELERATION_ANY)
+        
+        if mode == "CUDA" and 'OPENCV_FFMPEG_CAPTURE_OPTIONS' not in os.environ:
+            cap = self._open_cuvid_capture(file_path)
+        else:
+            # User-exported OPENCV_FFMPEG_CAPTURE_OPTIONS are picked up by OpenCV here
+            params = [cv2.CAP_PROP_HW_ACCELERATION, accel]
+            if accel != cv2.VIDEO_ACCELERATION_NONE:
+                params += [cv2.CAP_PROP_HW_DEVICE, 0]
+            cap = cv2.VideoCapture(file_path, cv2.CAP_FFMPEG, params)
+        
+        if cap is not None and cap.isOpened():
+            ret, frame = cap.read()
+            if ret:
+                return cap, frame, mode
+            cap.release()
+        
+        # Hardware decode unavailable for this file/driver: reopen in software
+        logger.warning(f"Hardware decode ({mode}) unavailable, using software decode")
+        cap = cv2.VideoCapture(file_path, cv2.CAP_FFMPEG)
+        ret, frame = cap.read() if cap.isOpened() else (False, None)
+        return cap, (frame if ret else None), "None"
+    
+    def _open_cuvid_capture(self, file_path):
+        """Open capture through FFmpeg's NVDEC decoder for the file's codec"""
+        probe = cv2.VideoCapture(file_path, cv2.CAP_FFMPEG)
+        fourcc = (int(probe.get(cv2.CAP_PROP_FOURCC)) & 0xFFFFFFFF).to_bytes(4, 'little').decode('ascii', 'ignore').lower()
+        probe.release()
+        
+        decoder = CUVID_DECODERS.get(fourcc)
+        if decoder is None:
+            return None
+        
+        # OpenCV reads the capture options from the environment at construction time
+        os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = f"video_codec;{decoder}"
+        try:
+            return cv2.VideoCapture(file_path, cv2.CAP_FFMPEG)
+        finally:
+            del os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS']
+    
+    def _tune_threads(self, width, height):
+        """Pick the OpenCV thread count for this frame size and show it in the status bar"""
+        threads = tune_thread_count(width, height)
+        self.threads_var.set(f"OpenCV threads: {threads}")
+        logger.info(f"OpenCV threads for {width}x{height}: {threads}")
+    
+    def _index_keyframes(self, file_path, fps):
+        """Worker: fill _keyframes from the container's packet flags via ffprobe"""
+        # Packet headers are read without decoding, so this is quick even for long files
+        try:
+            result = subprocess.run(
+                ["ffprobe", "-v", "error", "-select_streams", "v:0",
+                 "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", file_path],
+                capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.info(f"No keyframe index, seeks fall back to the decoder: {e}")
+            return
+        
+        pts, key = [], []
+        for line in result.stdout.splitlines():
+            pts_time, _, flags = line.partition(',')
+            try:
+                pts.append(float(pts_time))
+            except ValueError:
+                continue  # packet without a timestamp
+            key.append(flags.startswith('K'))
+        
+        if not pts or fps <= 0:
+            return
+        
+        # Frame indices count from the first presented frame, as CAP_PROP_POS_FRAMES does
+        pts = np.array(pts)
+        indices = np.rint((pts[np.array(key)] - pts.min()) * fps).astype(np.int64)
+        if self.video_path == file_path:
+            self._keyframes = np.unique(indices)
+            logger.info(f"Indexed {len(self._keyframes)} keyframes")
+    
     def update_metadata(self):
         """Update metadata display"""
         if self.video_cap:
@@ -499,45 +1001,146 @@ class VideoLabPro:
         self.is_playing = not self.is_playing
         self.play_button.config(text="Pause" if self.is_playing else "Play")
         
-        if self.is_playing and not self.preview_thread:
+        if self.is_playing:
             self.start_preview_thread()
-        elif not self.is_playing:
+        else:
             self.stop_preview_thread()
     
     def start_preview_thread(self):
-        """Start preview playback thread"""
-        if self.preview_thread and self.preview_thread.is_alive():
-            return
-        
+        """Start decoder and preview playback threads"""
         self.stop_preview = False
-        self.preview_thread = threading.Thread(target=self.preview_loop)
-        self.preview_thread.daemon = True
-        self.preview_thread.start()
+        self._playback_clock = None  # restarted by the first frame shown
+        
+        # Playback resumes right after the frame on screen
+        with self._cap_lock:
+            if self._next_read_idx != self.current_frame_idx + 1:
+                self._seek_generation += 1
+                self._position_capture(self.current_frame_idx + 1)
+        
+        if not (self.decode_thread and self.decode_thread.is_alive()):
+            self.decode_thread = threading.Thread(target=self.decode_loop, daemon=True)
+            self.decode_thread.start()
+        
+        if not (self.preview_thread and self.preview_thread.is_alive()):
+            self.preview_thread = threading.Thread(target=self.preview_loop, daemon=True)
+            self.preview_thread.start()
     
     def stop_preview_thread(self):
-        """Stop preview thread"""
+        """Stop decoder and preview threads"""
         self.stop_preview = True
-        if self.preview_thread:
-            self.preview_thread.join(timeout=1)
+        for thread in (self.decode_thread, self.preview_thread):
+            if thread:
+                thread.join(timeout=1)
+        self._drain_frame_queue()
+    
+    def decode_loop(self):
+        """Decoder thread: read frames sequentially ahead of playback into frame_queue"""
+        while self.is_playing and not self.stop_preview:
+            with self._cap_lock:
+                generation = self._seek_generation
+                
+                # When playback has fallen behind the clock, skip straight to
+                # the frame that is due instead of decoding late ones in full
+                target = self._playback_target(generation)
+                if (target is not None and self._next_read_idx is not None
+                        and self._next_read_idx < target < self.frame_count):
+                    self._position_capture(target)
+                
+                idx = self._next_read_idx
+                ret = False
+                if idx is not None and idx < self.frame_count:
+                    ret, frame = self.video_cap.read()
+                    self._next_read_idx = idx + 1 if ret else None
+            
+            if ret:
+                # Downscale right after decode so effects run at preview size.
+                # Blocks while the queue is full, so decode never runs more
+                # than frame_queue.maxsize frames ahead of the display.
+                scale = self.preview_scale
+                self._put_frame((generation, idx, frame, self._make_proxy(frame, scale), scale))
+                continue
+            
+            # End of stream: tell the consumer, then idle until a seek moves us
+            self._put_frame((generation, None, None, None, None))
+            while (generation == self._seek_generation
+                   and self.is_playing and not self.stop_preview):
+                time.sleep(0.01)
+    
+    def _put_frame(self, item):
+        """Queue a decoded frame, giving up if playback stops while the queue is full"""
+        while self.is_playing and not self.stop_preview:
+            try:
+                self.frame_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def _drain_frame_queue(self):
+        """Drop all prefetched frames"""
+        while True:
+            try:
+                self.frame_queue.get_nowait()
+            except queue.Empty:
+                return
     
     def preview_loop(self):
-        """Main preview loop"""
+        """Playback loop: consume decoded frames, apply effects, hand them to Tk"""
         frame_time = 1.0 / self.fps if self.fps > 0 else 1.0/30
         
         while self.is_playing and not self.stop_preview:
-            start_time = time.time()
+            try:
+                generation, idx, frame, proxy, scale = self.frame_queue.get(timeout=frame_time)
+            except queue.Empty:
+                continue
             
-            if self.current_frame_idx >= self.frame_count - 1:
+            if generation != self._seek_generation:
+                continue  # decoded before a seek
+            
+            if frame is None:
                 self.is_playing = False
                 self.root.after(0, lambda: self.play_button.config(text="Play"))
                 break
             
-            self.step_frame(1)
+            # Drop frames that are already late, as long as a newer one is
+            # waiting, so playback keeps pace with the clock instead of
+            # drifting behind it
+            target = self._playback_target(generation)
+            if target is None:
+                self._playback_clock = (generation, time.monotonic(), idx)
+            elif idx < target and not self.frame_queue.empty():
+                continue
+            
+            processed = self.apply_effects_pipeline(proxy, scale)
             
-            # Frame rate limiting
-            elapsed = time.time() - start_time
-            if elapsed < frame_time:
-                time.sleep(frame_time - elapsed)
+            # Hold the frame until its deadline on the playback clock. Deadlines
+            # come from the clock's start, so timing errors don't accumulate.
+            _, start_time, start_idx = self._playback_clock
+            delay = start_time + (idx - start_idx) * frame_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.root.after(0, self._show_frame, generation, idx, frame, proxy, scale, processed)
+    
+    def _playback_target(self, generation):
+        """Index of the frame due on screen now, None until playback of generation is clocked"""
+        clock = self._playback_clock
+        if clock is None or clock[0] != generation:
+            return None
+        _, start_time, start_idx = clock
+        fps = self.fps if self.fps > 0 else 30
+        return start_idx + int((time.monotonic() - start_time) * fps)
+    
+    def _show_frame(self, generation, idx, frame, proxy, scale, processed):
+        """Display a frame produced by the playback threads"""
+        if generation != self._seek_generation:
+            return
+        
+        self.current_frame_idx = idx
+        self.current_frame = frame
+        self._proxy_source, self._proxy_frame, self._proxy_scale = frame, proxy, scale
+        self.processed_frame = processed
+        self.display_processed_frame()
+        self.timeline_var.set(idx)
+        self.update_tracking()
     
     def step_frame(self, delta):
         """Step forward/backward by delta frames"""
@@ -547,12 +1150,66 @@ class VideoLabPro:
         new_idx = max(0, min(self.frame_count - 1, self.current_frame_idx + delta))
         if new_idx != self.current_frame_idx:
             self.current_frame_idx = new_idx
-            self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, self.current_frame_idx)
-            ret, frame = self.video_cap.read()
-            if ret:
+            frame = self._read_frame(new_idx)
+            if frame is not None:
                 self.current_frame = frame
                 self.update_preview_display()
                 self.timeline_var.set(self.current_frame_idx)
+                self.update_tracking()
+    
+    def _read_frame(self, idx):
+        """Read frame idx, from the frame cache or by seeking the capture"""
+        with self._cap_lock:
+            # Invalidate anything the decoder thread prefetched from the old position
+            self._seek_generation += 1
+            self._drain_frame_queue()
+            
+            frame = self._frame_cache.get(idx)
+            if frame is not None:
+                self._frame_cache.move_to_end(idx)
+                if self.is_playing:
+                    # Playback carries on from here, so the capture still has to move
+                    self._position_capture(idx + 1)
+                return frame
+            
+            self._position_capture(idx)
+            ret, frame = self.video_cap.read()
+            self._next_read_idx = idx + 1 if ret else None
+            if not ret:
+                return None
+        
+        self._frame_cache[idx] = frame
+        if len(self._frame_cache) > FRAME_CACHE_SIZE:
+            self._frame_cache.popitem(last=False)
+        return frame
+    
+    def _position_capture(self, idx):
+        """Move the capture so its next read() returns frame idx; caller holds _cap_lock"""
+        current = self._next_read_idx
+        if current == idx:
+            return
+        
+        keyframes = self._keyframes
+        if len(keyframes):
+            # Decoding from the capture's position is never slower than a seek
+            # unless a keyframe lies in between
+            pos = np.searchsorted(keyframes, idx, side='right')
+            kf = int(keyframes[pos - 1]) if pos else 0
+            if current is not None and kf <= current < idx:
+                ahead = idx - current
+            else:
+                self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, kf)
+                ahead = idx - kf
+        else:
+            ahead = idx - current if current is not None else -1
+            if not 0 <= ahead <= MAX_GRAB_AHEAD:
+                self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+                ahead = 0
+        
+        # grab() skips the colour conversion/copy of frames we don't display
+        for _ in range(ahead):
+            self.video_cap.grab()
+        self._next_read_idx = idx
     
     def seek_frame(self, value):
         """Seek to specific frame"""
@@ -562,97 +1219,454 @@ class VideoLabPro:
         frame_idx = int(float(value))
         if frame_idx != self.current_frame_idx:
             self.current_frame_idx = frame_idx
-            self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = self.video_cap.read()
-            if ret:
+            frame = self._read_frame(frame_idx)
+            if frame is not None:
                 self.current_frame = frame
                 self.update_preview_display()
+                self.update_tracking()
     
-    def apply_effects_pipeline(self, frame):
-        """Apply all effects in pipeline"""
+    def apply_effects_pipeline(self, frame, scale=1.0):
+        """Apply all effects in pipeline
+        
+        scale is frame's size relative to the source video; preview proxies
+        pass preview_scale so pixel-sized parameters are scaled to match.
+        """
         if frame is None:
             return None
         
-        processed = frame.copy()
+        p = self.params if scale == 1.0 else self._scaled_params(scale)
         
-        for effect in self.effects_pipeline:
-            if effect['type'] == 'canny':
-                gray = cv2.cvtColor(processed, cv2.COLOR_BGR2GRAY)
-                edges = cv2.Canny(gray, int(self.canny_low.get()), int(self.canny_high.get()))
-                processed = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
-            
-            elif effect['type'] == 'gaussian_blur':
-                ksize = int(self.blur_kernel.get())
-                if ksize % 2 == 0:
-                    ksize += 1
-                processed = cv2.GaussianBlur(processed, (ksize, ksize), self.blur_sigma.get())
-            
-            elif effect['type'] == 'color_adjust':
-                processed = cv2.convertScaleAbs(processed, alpha=self.contrast.get(), beta=self.brightness.get())
-            
-            elif effect['type'] == 'text':
-                cv2.putText(processed, self.text_content.get(), (50, 50), 
-                           cv2.FONT_HERSHEY_SIMPLEX, self.text_size.get()/50.0, (255, 255, 255), 2)
+        # Crop first, so effects only touch pixels that are kept. The crop is
+        # a view; the first step copies it out of the decoded frame.
+        if p.crop_enabled:
+            frame, p = self._crop_view(frame, p, scale)
+        
+        processed = self._pipeline_runner(p, scale)(frame)
         
         # Apply overlay if present
         if self.overlay_image is not None:
-            processed = self.apply_overlay(processed)
-        
-        # Apply crop if enabled
-        if self.crop_enabled.get():
-            x, y, w, h = self.crop_x.get(), self.crop_y.get(), self.crop_w.get(), self.crop_h.get()
-            processed = processed[y:y+h, x:x+w]
+            processed = self.apply_overlay(processed, p)
         
         return processed
     
-    def apply_overlay(self, frame):
+    def _crop_view(self, frame, p, scale):
+        """View of frame inside the crop rectangle, and p with positions relative to it"""
+        fh, fw = frame.shape[:2]
+        x = min(max(p.crop_x, 0), fw - 1)
+        y = min(max(p.crop_y, 0), fh - 1)
+        w = min(p.crop_w, fw - x)
+        h = min(p.crop_h, fh - y)
+        if w <= 0 or h <= 0:
+            return frame, p  # no crop size set yet
+        
+        cached = self._crop_params_cache.get(scale)
+        if cached and cached[0] is p and cached[1] == (x, y):
+            return frame[y:y+h, x:x+w], cached[2]
+        
+        # Text and overlay stay where they were on the full frame
+        shifted = replace(p, text_x=p.text_x - x, text_y=p.text_y - y,
+                          overlay_x=p.overlay_x - x, overlay_y=p.overlay_y - y)
+        if len(self._crop_params_cache) > 4:
+            self._crop_params_cache.clear()
+        self._crop_params_cache[scale] = (p, (x, y), shifted)
+        return frame[y:y+h, x:x+w], shifted
+    
+    def _scaled_params(self, scale):
+        """self.params with pixel-sized parameters scaled for a proxy frame"""
+        p = self.params
+        cached = self._scaled_params_cache
+        if cached and cached[0] is p and cached[1] == scale:
+            return cached[2]
+        
+        scaled = replace(
+            p,
+            blur_ksize=blur_kernel_size(round(p.blur_ksize * scale), p.blur_sigma * scale),
+            blur_sigma=p.blur_sigma * scale,
+            text_scale=p.text_scale * scale,
+            text_x=int(p.text_x * scale),
+            text_y=int(p.text_y * scale),
+            text_thickness=max(1, int(round(p.text_thickness * scale))),
+            overlay_x=int(p.overlay_x * scale),
+            overlay_y=int(p.overlay_y * scale),
+            overlay_scale=p.overlay_scale * scale,
+            crop_x=int(p.crop_x * scale),
+            crop_y=int(p.crop_y * scale),
+            crop_w=int(p.crop_w * scale),
+            crop_h=int(p.crop_h * scale),
+        )
+        self._scaled_params_cache = (p, scale, scaled)
+        return scaled
+    
+    def _pipeline_runner(self, p, scale):
+        """frame -> processed frame for the compiled steps with arguments bound from p
+        
+        Rebuilt only when the pipeline or p changes, and cached per scale so
+        preview proxies and full-size exports each keep their own.
+        """
+        compiled = self._compiled_pipeline
+        cached = self._bound_pipelines.get(scale)
+        if cached and cached[0] is compiled and cached[1] is p:
+            return cached[2]
+        
+        backend, steps = compiled
+        bound = [(fn, bind(p), in_place) for fn, bind, in_place in steps]
+        if backend == "CPU":
+            runner = self._cpu_runner(bound)
+        else:
+            runner = self._device_runner(bound, backend)
+        
+        if len(self._bound_pipelines) > 4:
+            self._bound_pipelines.clear()  # preview scale changed a few times
+        self._bound_pipelines[scale] = (compiled, p, runner)
+        return runner
+    
+    def _cpu_runner(self, steps):
+        """Runner for bound steps on the CPU, producing a new result buffer per frame"""
+        # Steps ping-pong between the result buffer (slot 0) and a per-thread
+        # scratch buffer (slot 1), ordered so the last out-of-place step
+        # writes into the result. In-place steps get slot None.
+        out_of_place = sum(1 for _, _, in_place in steps if not in_place)
+        plan = []
+        for fn, args, in_place in steps:
+            if in_place:
+                plan.append((fn, args, None))
+            else:
+                out_of_place -= 1
+                plan.append((fn, args, out_of_place % 2))
+        
+        def run(frame):
+            buffers = (np.empty_like(frame), self._scratch_buffer(frame))
+            processed = frame
+            for fn, args, slot in plan:
+                if slot is None:
+                    fn(processed, *args)
+                else:
+                    processed = fn(processed, buffers[slot], *args)
+            return processed
+        return run
+    
+    def _device_runner(self, steps, backend):
+        """Runner for bound steps with frames resident on the GPU, downloading once"""
+        def run(frame):
+            if backend == "CUDA":
+                processed = cv2.cuda_GpuMat()
+                processed.upload(frame)
+            else:
+                # OpenCL: OpenCV's T-API dispatches the ordinary calls on UMat
+                processed = cv2.UMat(frame)
+            
+            for fn, args, in_place in steps:
+                if in_place:
+                    fn(processed, *args)
+                else:
+                    processed = fn(processed, None, *args)
+            
+            return processed.download() if backend == "CUDA" else processed.get()
+        return run
+    
+    def _scratch_buffer(self, frame):
+        """Per-thread scratch buffer matching frame, reused across frames"""
+        buf = getattr(self._scratch, 'buf', None)
+        if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+            buf = self._scratch.buf = np.empty_like(frame)
+        return buf
+    
+    def _compile_pipeline(self):
+        """Build the per-frame step list from effects_pipeline
+        
+        Each step is (fn, bind, in_place); bind(params) gives fn's arguments,
+        so the per-frame loop does no lookups on the effect descriptions.
+        """
+        backend = self.processing_backend.get()
+        if backend == "CUDA":
+            step_fns = {'canny': self._cuda_canny_step, 'gaussian_blur': self._cuda_blur_step,
+                        'color_adjust': self._cuda_color_step, 'text': self._cuda_text_step}
+        else:
+            step_fns = {'canny': _apply_canny, 'gaussian_blur': _apply_blur,
+                        'color_adjust': _apply_color, 'text': _apply_text}
+        binders = {
+            'canny': lambda p: (p.canny_low, p.canny_high),
+            'gaussian_blur': lambda p: (p.blur_ksize, p.blur_sigma),
+            'text': lambda p: (p.text, (p.text_x, p.text_y), p.text_scale, p.text_thickness),
+        }
+        
+        steps = []
+        passes = 0
+        for effect in self.effects_pipeline:
+            fn = step_fns.get(effect['type'])
+            
+            if effect['type'] == 'color_adjust':
+                # Consecutive colour adjustments collapse into a single pass
+                passes = passes + 1 if steps and steps[-1][0] == fn else 1
+                if passes > 1:
+                    steps.pop()
+                steps.append((fn, lambda p, n=passes: (compose_lut(p.color_lut, n),), False))
+            
+            elif fn is not None:
+                steps.append((fn, binders[effect['type']], effect['type'] == 'text'))
+        
+        # In-place steps (text, overlay) must never draw on the decoded frame.
+        # Device backends get their own copy from the upload.
+        if backend == "CPU" and (not steps or steps[0][2]):
+            steps.insert(0, (_apply_copy, lambda p: (), False))
+        
+        self._compiled_pipeline = (backend, steps)
+    
+    def _on_backend_change(self, event=None):
+        """Recompile the pipeline for the selected processing backend"""
+        if self.processing_backend.get() == "OpenCL":
+            cv2.ocl.setUseOpenCL(True)
+        self._compile_pipeline()
+        self._schedule_preview()
+    
+    def _cuda_filter(self, key, factory):
+        """Cached CUDA filter object for the given parameters, per thread"""
+        filters = getattr(self._cuda_filters, 'filters', None)
+        if filters is None:
+            filters = self._cuda_filters.filters = {}
+        cuda_filter = filters.get(key)
+        if cuda_filter is None:
+            if len(filters) > 32:
+                filters.clear()
+            cuda_filter = filters[key] = factory()
+        return cuda_filter
+    
+    def _cuda_canny_step(self, src, dst, low, high):
+        """Canny edges on the GPU"""
+        detector = self._cuda_filter(('canny', low, high),
+                                     lambda: cv2.cuda.createCannyEdgeDetector(low, high))
+        gray = cv2.cuda.cvtColor(src, cv2.COLOR_BGR2GRAY)
+        return cv2.cuda.cvtColor(detector.detect(gray), cv2.COLOR_GRAY2BGR)
+    
+    def _cuda_blur_step(self, src, dst, ksize, sigma):
+        """Gaussian blur on the GPU"""
+        if ksize > CUDA_MAX_FILTER_KSIZE:
+            # Beyond the CUDA filter's kernel limit: blur this step on the host
+            src.upload(_apply_blur(src.download(), None, ksize, sigma))
+            return src
+        
+        gaussian = self._cuda_filter(('gaussian', ksize, sigma),
+                                     lambda: cv2.cuda.createGaussianFilter(cv2.CV_8UC3, cv2.CV_8UC3,
+                                                                           (ksize, ksize), sigma))
+        return gaussian.apply(src)
+    
+    def _cuda_color_step(self, src, dst, lut):
+        """Brightness/contrast adjustment on the GPU via lookup table"""
+        table = self._cuda_filter(('lut', lut.tobytes()),
+                                  lambda: cv2.cuda.createLookUpTable(lut.reshape(1, 256)))
+        return table.transform(src)
+    
+    def _cuda_text_step(self, img, *args):
+        """Draw the text overlay; putText has no CUDA variant so it round-trips"""
+        host = img.download()
+        _apply_text(host, *args)
+        img.upload(host)
+    
+    def apply_overlay(self, frame, p):
         """Apply overlay image"""
         if self.overlay_image is None:
             return frame
         
-        x, y = self.overlay_x.get(), self.overlay_y.get()
-        scale = self.overlay_scale.get()
-        opacity = self.overlay_opacity.get()
-        
-        # Resize overlay
-        overlay = cv2.resize(self.overlay_image, None, fx=scale, fy=scale)
-        h, w = overlay.shape[:2]
+        x, y = p.overlay_x, p.overlay_y
+        matte = self._overlay_matte(p.overlay_scale, p.overlay_opacity)
+        h, w = matte['bgr'].shape[:2]
         
-        # Check bounds
-        if x + w > frame.shape[1] or y + h > frame.shape[0] or x < 0 or y < 0:
+        # Clip to the frame, which may be a crop the overlay only partly covers
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, frame.shape[1]), min(y + h, frame.shape[0])
+        if x0 >= x1 or y0 >= y1:
             return frame
         
-        # Apply overlay with alpha blending
-        roi = frame[y:y+h, x:x+w]
-        result = cv2.addWeighted(roi, 1-opacity, overlay, opacity, 0)
-        frame[y:y+h, x:x+w] = result
+        # Blend in place: roi * (1 - opacity) + overlay * opacity, the second
+        # term precomputed in the matte
+        roi = frame[y0:y1, x0:x1]
+        bgr = matte['bgr'][y0-y:y1-y, x0-x:x1-x]
+        if 'inv' in matte:
+            # Per-pixel alpha in uint16 fixed point: (roi * inv + bgr * a + 128) >> 8
+            inv = matte['inv'][y0-y:y1-y, x0-x:x1-x]
+            if HAS_NUMBA:
+                _blend_premultiplied(roi, bgr, inv)  # one pass, no temporaries
+            else:
+                blended = np.multiply(roi, inv, dtype=np.uint16)
+                blended += bgr
+                blended >>= 8
+                np.copyto(roi, blended, casting='unsafe')
+        elif matte['inv_alpha'] == 0.0:
+            np.copyto(roi, bgr)
+        elif matte['inv_alpha'] < 1.0:
+            cv2.addWeighted(roi, matte['inv_alpha'], bgr, 1.0, 0, dst=roi)
         
         return frame
     
+    def _overlay_matte(self, scale, opacity):
+        """Resized overlay premultiplied by opacity, cached per (scale, opacity)
+        
+        Opaque overlays blend with a single weight, inv_alpha. Overlays with an
+        alpha channel carry per-pixel weights out of 256 instead: 'inv' for the
+        frame, and 'bgr' as the overlay already multiplied by its weight (plus
+        rounding), both uint16.
+        """
+        cache = self._overlay_cache
+        matte = cache.get((scale, opacity))
+        if matte is None:
+            overlay = self._resized_overlay(scale)
+            matte = {'scale': scale, 'opacity': opacity}
+            if overlay.shape[2] == 4:
+                # Map alpha 0..255 onto 0..256 so fully opaque pixels weigh exactly 256
+                alpha = overlay[..., 3].astype(np.uint32)
+                alpha += alpha >> 7
+                alpha = ((alpha * int(round(opacity * 256)) + 128) >> 8).astype(np.uint16)
+                weight = cv2.merge([alpha] * 3)
+                matte['inv'] = aligned_copy(256 - weight)
+                matte['bgr'] = aligned_copy(overlay[..., :3] * weight + 128)
+            else:
+                matte['bgr'] = aligned_copy(cv2.convertScaleAbs(overlay, alpha=opacity))
+                matte['inv_alpha'] = 1.0 - opacity
+            # Preview and export each use their own scale; keep only a few
+            if len(cache) >= 4:
+                cache.clear()
+            cache[(scale, opacity)] = matte
+        return matte
+    
+    def _resized_overlay(self, scale):
+        """Overlay image resized by scale, shared by mattes of any opacity"""
+        key = (scale, self.overlay_image.shape)
+        resized = self._overlay_resized.get(key)
+        if resized is None:
+            # Area averaging avoids aliasing when shrinking; it is only a
+            # blocky nearest-neighbour when enlarging
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            resized = cv2.resize(self.overlay_image, None, fx=scale, fy=scale, interpolation=interpolation)
+            if len(self._overlay_resized) >= 4:
+                self._overlay_resized.clear()
+            self._overlay_resized[key] = resized
+        return resized
+    
     def update_preview_display(self):
-        """Update preview display"""
+        """Redraw current_frame with effects applied, processed off the Tk thread"""
         if self.current_frame is None:
             return
         
-        # Apply effects
-        self.processed_frame = self.apply_effects_pipeline(self.current_frame)
-        
-        # Scale for preview
-        preview_frame = cv2.resize(self.processed_frame, None, fx=self.preview_scale, fy=self.preview_scale)
-        
-        # Convert to PIL and display
-        preview_rgb = cv2.cvtColor(preview_frame, cv2.COLOR_BGR2RGB)
-        preview_pil = Image.fromarray(preview_rgb)
-        preview_tk = ImageTk.PhotoImage(preview_pil)
-        
-        self.preview_label.config(image=preview_tk)
-        self.preview_label.image = preview_tk
+        # Latest wins: a request the worker hasn't picked up yet is replaced
+        # Frames queued before a preview scale change carry proxies at the old scale
+        reuse = self._proxy_source is self.current_frame and self._proxy_scale == self.preview_scale
+        proxy = self._proxy_frame if reuse else None
+        try:
+            self._preview_requests.get_nowait()
+        except queue.Empty:
+            pass
+        self._preview_requests.put_nowait((self.current_frame, proxy, self.preview_scale))
+    
+    def _preview_worker(self):
+        """Apply effects for update_preview_display requests and hand the results to Tk"""
+        while True:
+            frame, proxy, scale = self._preview_requests.get()
+            try:
+                # Effects run on a preview-sized proxy, made once per source frame
+                if proxy is None:
+                    proxy = self._make_proxy(frame, scale)
+                processed = self.apply_effects_pipeline(proxy, scale)
+            except Exception as e:
+                logger.error(f"Preview failed: {e}")
+                continue
+            self.root.after(0, self._show_preview, frame, proxy, scale, processed)
+    
+    def _show_preview(self, frame, proxy, scale, processed):
+        """Display a frame processed by _preview_worker, unless it is already stale"""
+        if frame is not self.current_frame or scale != self.preview_scale:
+            return
+        self._proxy_source, self._proxy_frame, self._proxy_scale = frame, proxy, scale
+        self.processed_frame = processed
+        self.display_processed_frame()
+    
+    def _make_proxy(self, frame, scale):
+        """Downscale a decoded frame to preview resolution"""
+        if scale == 1.0:
+            return frame  # effects never write into their input, so no copy is needed
+        h, w = frame.shape[:2]
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    
+    def _set_display_data(self, ppm):
+        """Load a binary PPM into the preview PhotoImage"""
+        # The format hint spares Tk trying each image format handler in turn
+        if not self._ppm_base64:
+            try:
+                self._display_img.configure(data=ppm, format="PPM")
+                return
+            except tk.TclError:
+                logger.info("Tk rejected binary PPM data, falling back to base64")
+                self._ppm_base64 = True
+        self._display_img.configure(data=base64.b64encode(ppm), format="PPM")
+    
+    def _on_preview_scale_change(self, event=None):
+        """Apply a new preview resolution"""
+        self.preview_scale = int(self.preview_scale_var.get().rstrip('%')) / 100.0
+        self._proxy_source = None
+        self._schedule_preview()
+    
+    def display_processed_frame(self):
+        """Show processed_frame (already at preview size) in the preview label"""
+        # Tk parses binary PPM natively, so the frame goes straight into the
+        # persistent PhotoImage without a PIL intermediate. The colour
+        # conversion writes into the pixel area of a reusable PPM buffer.
+        h, w = self.processed_frame.shape[:2]
+        if self._ppm_rgb is None or self._ppm_rgb.shape[:2] != (h, w):
+            header = b"P6\n%d %d\n255\n" % (w, h)
+            self._ppm_buf = bytearray(len(header) + h * w * 3)
+            self._ppm_buf[:len(header)] = header
+            self._ppm_rgb = np.frombuffer(self._ppm_buf, np.uint8, offset=len(header)).reshape(h, w, 3)
+        
+        cv2.cvtColor(self.processed_frame, cv2.COLOR_BGR2RGB, dst=self._ppm_rgb)
+        self._set_display_data(bytes(self._ppm_buf))  # Tk takes bytes, not bytearray
+        
+        if getattr(self.preview_label, 'image', None) is not self._display_img:
+            self.preview_label.config(image=self._display_img)
+            self.preview_label.image = self._display_img
         
         # Update frame info
         time_seconds = self.current_frame_idx / self.fps if self.fps > 0 else 0
         time_str = f"{int(time_seconds//3600):02d}:{int((time_seconds%3600)//60):02d}:{int(time_seconds%60):02d}"
         self.frame_info_var.set(f"Frame: {self.current_frame_idx}/{self.frame_count} | FPS: {self.fps:.1f} | Time: {time_str}")
     
+    def _sync_params(self, *args):
+        """Snapshot the Tk controls into self.params and schedule a preview refresh"""
+        blur_sigma = self.blur_sigma.get()
+        brightness, contrast = self.brightness.get(), self.contrast.get()
+        color_lut = cv2.convertScaleAbs(np.arange(256, dtype=np.uint8), alpha=contrast, beta=brightness)
+        self.params = EffectParams(
+            canny_low=int(self.canny_low.get()),
+            canny_high=int(self.canny_high.get()),
+            blur_ksize=blur_kernel_size(self.blur_kernel.get(), blur_sigma),
+            blur_sigma=blur_sigma,
+            brightness=brightness,
+            contrast=contrast,
+            color_lut=color_lut.reshape(256),
+            text=self.text_content.get(),
+            text_scale=self.text_size.get()/50.0,
+            overlay_x=self.overlay_x.get(),
+            overlay_y=self.overlay_y.get(),
+            overlay_opacity=self.overlay_opacity.get(),
+            overlay_scale=self.overlay_scale.get(),
+            crop_enabled=self.crop_enabled.get(),
+            crop_x=self.crop_x.get(),
+            crop_y=self.crop_y.get(),
+            crop_w=self.crop_w.get(),
+            crop_h=self.crop_h.get(),
+        )
+        self._schedule_preview()
+    
+    def _schedule_preview(self):
+        """Coalesce a burst of control changes into at most one redraw per ~16 ms"""
+        if self._preview_pending:
+            return
+        self._preview_pending = self.root.after(16, self._do_preview)
+    
+    def _do_preview(self):
+        """Run the redraw requested by _schedule_preview"""
+        self._preview_pending = None
+        self.update_preview()
+    
     def update_preview(self, *args):
         """Update preview when parameters change"""
         if self.current_frame is not None:
@@ -663,8 +1677,9 @@ class VideoLabPro:
         """Add effect to pipeline"""
         effect = {'type': effect_type, 'enabled': True}
         self.effects_pipeline.append(effect)
+        self._compile_pipeline()
         self.update_effects_list()
-        self.update_preview()
+        self._schedule_preview()
     
     def remove_effect(self):
         """Remove selected effect"""
@@ -672,14 +1687,16 @@ class VideoLabPro:
         if selection:
             idx = selection[0]
             del self.effects_pipeline[idx]
+            self._compile_pipeline()
             self.update_effects_list()
-            self.update_preview()
+            self._schedule_preview()
     
     def clear_effects(self):
         """Clear all effects"""
         self.effects_pipeline.clear()
+        self._compile_pipeline()
         self.update_effects_list()
-        self.update_preview()
+        self._schedule_preview()
     
     def update_effects_list(self):
         """Update effects listbox"""
@@ -697,18 +1714,23 @@ class VideoLabPro:
         
         if file_path:
             try:
-                self.overlay_image = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
-                if self.overlay_image.shape[2] == 4:  # RGBA
-                    self.overlay_image = cv2.cvtColor(self.overlay_image, cv2.COLOR_BGRA2BGR)
+                image = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
+                if image is None:
+                    raise ValueError("unsupported or unreadable image")
+                self.overlay_image = normalize_overlay(image)
+                self._overlay_cache = {}
+                self._overlay_resized = {}
                 self.status_var.set(f"Loaded overlay: {Path(file_path).name}")
-                self.update_preview()
+                self._schedule_preview()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load overlay: {str(e)}")
     
     def clear_overlay(self):
         """Clear overlay"""
         self.overlay_image = None
-        self.update_preview()
+        self._overlay_cache = {}
+        self._overlay_resized = {}
+        self._schedule_preview()
     
     def update_overlay_params(self, *args):
         """Update overlay parameters"""
@@ -716,7 +1738,7 @@ class VideoLabPro:
         self.overlay_params['y'] = self.overlay_y.get()
         self.overlay_params['opacity'] = self.overlay_opacity.get()
         self.overlay_params['scale'] = self.overlay_scale.get()
-        self.update_preview()
+        self._sync_params()
     
     # Geometry functions
     def update_crop_params(self, *args):
@@ -726,11 +1748,11 @@ class VideoLabPro:
         self.crop_params['w'] = self.crop_w.get()
         self.crop_params['h'] = self.crop_h.get()
         self.crop_params['enabled'] = self.crop_enabled.get()
-        self.update_preview()
+        self._sync_params()
     
     def set_aspect_ratio(self, w_ratio, h_ratio):
         """Set crop to specific aspect ratio"""
-        if not self.current_frame:
+        if self.current_frame is None:
             return
         
         frame_h, frame_w = self.current_frame.shape[:2]
@@ -754,7 +1776,7 @@ class VideoLabPro:
         self.crop_w.set(new_w)
         self.crop_h.set(new_h)
         self.crop_enabled.set(True)
-        self.update_preview()
+        self.update_crop_params()
     
     # Tracking functions
     def auto_detect_features(self):
@@ -762,19 +1784,81 @@ class VideoLabPro:
         if self.current_frame is None:
             return
         
-        gray = cv2.cvtColor(self.current_frame, cv2.COLOR_BGR2GRAY)
-        corners = cv2.goodFeaturesToTrack(gray, maxCorners=self.max_corners.get(), 
-                                          qualityLevel=self.quality_level.get(),
-                                          minDistance=self.min_distance.get(), blockSize=7)
+        # The gray frame is kept so tracking the next frame only converts that one
+        gray = self._to_gray(self.current_frame)
+        corners = self._detect_corners(gray)
         
         if corners is not None:
             self.track_points = corners.reshape(-1, 1, 2).astype(np.float32)
+            self._track_gray = gray
+            self._track_frame_idx = self.current_frame_idx
             self.update_track_info()
             self.status_var.set(f"Detected {len(self.track_points)} features")
     
+    def _detect_corners(self, gray):
+        """Up to max_corners points to track in gray as an (N, 1, 2) array, None if there are none"""
+        if gray.shape[1] < DETECT_DOWNSCALE_MIN_WIDTH:
+            return self._detect_corners_at(gray, self.min_distance.get())
+        
+        # A quarter of the pixels to search; the points are then mapped back
+        # (pixel centres line up at 2x + 0.5) and refined on the full frame
+        small = cv2.resize(gray, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+        corners = self._detect_corners_at(small, max(1, self.min_distance.get() // 2))
+        if corners is None:
+            return None
+        corners = corners * 2.0 + 0.5
+        cv2.cornerSubPix(gray, corners, (5, 5), (-1, -1),
+                         (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        return corners
+    
+    def _detect_corners_at(self, gray, min_distance):
+        """Corners of gray with the selected detector, None if there are none"""
+        if not self.fast_detector.get():
+            return cv2.goodFeaturesToTrack(gray, maxCorners=self.max_corners.get(),
+                                           qualityLevel=self.quality_level.get(),
+                                           minDistance=min_distance, blockSize=7)
+        
+        # FAST is a plain neighbourhood intensity test instead of a full-frame
+        # eigenvalue response; Quality Level maps onto its threshold. It has
+        # no minimum spacing beyond its own non-maximum suppression.
+        fast = cv2.FastFeatureDetector_create(threshold=max(1, int(self.quality_level.get() * 100)))
+        keypoints = sorted(fast.detect(gray), key=lambda kp: -kp.response)[:self.max_corners.get()]
+        if not keypoints:
+            return None
+        return np.array([[kp.pt] for kp in keypoints], np.float32)
+    
+    def _to_gray(self, frame):
+        """Convert frame into whichever gray buffer is not holding _track_gray"""
+        if not self._gray_bufs or self._gray_bufs[0].shape != frame.shape[:2]:
+            self._gray_bufs = [np.empty(frame.shape[:2], np.uint8) for _ in range(2)]
+            self._track_gray = None
+        
+        gray = self._gray_bufs[1] if self._gray_bufs[0] is self._track_gray else self._gray_bufs[0]
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+    
+    def update_tracking(self):
+        """Move track_points onto the current frame with pyramidal Lucas-Kanade"""
+        if not len(self.track_points) or self._track_frame_idx == self.current_frame_idx:
+            return
+        
+        gray = self._to_gray(self.current_frame)
+        
+        # Only adjacent frames are tracked; after a jump the points stay put
+        # and tracking restarts from the new frame
+        if self._track_frame_idx == self.current_frame_idx - 1 and self._track_gray is not None:
+            points, status, _ = cv2.calcOpticalFlowPyrLK(self._track_gray, gray,
+                                                         self.track_points, None, **self.lk_params)
+            self.track_points = points[status.ravel() == 1].reshape(-1, 1, 2)
+            self.update_track_info()
+        
+        self._track_gray = gray
+        self._track_frame_idx = self.current_frame_idx
+    
     def clear_tracks(self):
         """Clear all tracking points"""
         self.track_points = []
+        self._track_gray = None
+        self._track_frame_idx = None
         self.update_track_info()
     
     def update_track_info(self):
@@ -782,11 +1866,10 @@ class VideoLabPro:
         self.track_info_text.config(state=tk.NORMAL)
         self.track_info_text.delete(1.0, tk.END)
         
-        if self.track_points:
-            info = f"Tracking {len(self.track_points)} points:\n\n"
-            for i, point in enumerate(self.track_points[:10]):  # Show first 10
-                x, y = point[0]
-                info += f"Point {i+1}: ({x:.1f}, {y:.1f})\n"
+        if len(self.track_points):
+            points = self.track_points.reshape(-1, 2)[:10]  # Show first 10
+            lines = [f"Point {i+1}: ({x:.1f}, {y:.1f})\n" for i, (x, y) in enumerate(points.tolist())]
+            info = f"Tracking {len(self.track_points)} points:\n\n" + "".join(lines)
             if len(self.track_points) > 10:
                 info += f"... and {len(self.track_points) - 10} more points"
         else:
@@ -797,7 +1880,7 @@ class VideoLabPro:
     
     def export_tracks(self):
         """Export tracks to CSV"""
-        if not self.track_points:
+        if not len(self.track_points):
             messagebox.showwarning("Warning", "No tracking points to export")
             return
         
@@ -809,13 +1892,13 @@ class VideoLabPro:
         
         if file_path:
             try:
-                import csv
-                with open(file_path, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(['frame', 'point_id', 'x', 'y'])
-                    for i, point in enumerate(self.track_points):
-                        x, y = point[0]
-                        writer.writerow([self.current_frame_idx, i, x, y])
+                points = self.track_points.reshape(-1, 2)
+                rows = np.empty((len(points), 4))
+                rows[:, 0] = self.current_frame_idx
+                rows[:, 1] = np.arange(len(points))
+                rows[:, 2:] = points
+                np.savetxt(file_path, rows, fmt=['%d', '%d', '%.6g', '%.6g'], delimiter=',',
+                           header='frame,point_id,x,y', comments='')
                 
                 self.status_var.set(f"Exported tracks to {Path(file_path).name}")
             except Exception as e:
@@ -829,8 +1912,7 @@ class VideoLabPro:
         
         name = simpledialog.askstring("Marker Name", "Enter marker name:")
         if name:
-            marker = {'frame': self.current_frame_idx, 'name': name}
-            self.markers.append(marker)
+            bisect.insort(self.markers, (self.current_frame_idx, name))
             self.update_markers_list()
     
     def clear_markers(self):
@@ -841,23 +1923,22 @@ class VideoLabPro:
     def update_markers_list(self):
         """Update markers listbox"""
         self.markers_listbox.delete(0, tk.END)
-        for marker in sorted(self.markers, key=lambda x: x['frame']):
-            time_seconds = marker['frame'] / self.fps if self.fps > 0 else 0
+        for frame, name in self.markers:
+            time_seconds = frame / self.fps if self.fps > 0 else 0
             time_str = f"{int(time_seconds//60):02d}:{int(time_seconds%60):02d}"
-            self.markers_listbox.insert(tk.END, f"Frame {marker['frame']} ({time_str}) - {marker['name']}")
+            self.markers_listbox.insert(tk.END, f"Frame {frame} ({time_str}) - {name}")
     
     def jump_to_marker(self, event):
         """Jump to selected marker"""
         selection = self.markers_listbox.curselection()
         if selection:
-            marker = sorted(self.markers, key=lambda x: x['frame'])[selection[0]]
-            self.current_frame_idx = marker['frame']
-            self.timeline_var.set(self.current_frame_idx)
-            self.seek_frame(self.current_frame_idx)
+            frame, _ = self.markers[selection[0]]
+            self.timeline_var.set(frame)
+            self.seek_frame(frame)
     
     def snapshot_frame(self):
         """Save snapshot of current processed frame"""
-        if self.processed_frame is None:
+        if self.current_frame is None:
             return
         
         file_path = filedialog.asksaveasfilename(
@@ -868,7 +1949,8 @@ class VideoLabPro:
         
         if file_path:
             try:
-                cv2.imwrite(file_path, self.processed_frame)
+                # The preview shows a proxy; render the snapshot at full resolution
+                cv2.imwrite(file_path, self.apply_effects_pipeline(self.current_frame))
                 self.status_var.set(f"Saved snapshot: {Path(file_path).name}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save snapshot: {str(e)}")
@@ -887,39 +1969,52 @@ class VideoLabPro:
         )
         
         if file_path:
-            threading.Thread(target=self._export_video_worker, args=(file_path,), daemon=True).start()
+            # Tk variables are read here, on the Tk thread
+            settings = (self.export_encoder.get(), int(self.export_quality.get()), self.export_fps.get())
+            threading.Thread(target=self._export_video_worker, args=(file_path, *settings),
+                             daemon=True).start()
     
-    def _export_video_worker(self, output_path):
+    def _export_video_worker(self, output_path, encoder, quality, fps):
         """Export video worker thread"""
         try:
-            # Get video properties
-            frame_width = int(self.video_cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            frame_height = int(self.video_cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            encoders = ffmpeg_encoders()
+            if encoders is None:
+                encoder = "OpenCV mp4v"
+            elif encoder == "Auto":
+                encoder = pick_export_encoder() or "OpenCV mp4v"
+            elif encoder not in encoders:
+                logger.warning(f"ffmpeg has no {encoder} encoder, using libx264")
+                encoder = "libx264"
             
-            if self.crop_enabled.get():
-                frame_width = self.crop_w.get()
-                frame_height = self.crop_h.get()
+            # A capture of its own lets the export read sequentially while
+            # the preview keeps seeking the shared one
+            cap = cv2.VideoCapture(self.video_path)
+            if not cap.isOpened():
+                raise RuntimeError(f"Cannot reopen {self.video_path}")
             
-            # Setup video writer
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(output_path, fourcc, self.export_fps.get(), (frame_width, frame_height))
+            self.root.after(0, lambda: self.export_status_var.set(f"Exporting ({encoder})..."))
             
-            self.root.after(0, lambda: self.export_status_var.set("Exporting..."))
+            # Decode and encode run on their own threads, overlapping a pool of
+            # effects workers; the encoder puts frames back in order
+            workers = max(1, (os.cpu_count() or 1) - 1)
+            decoded = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+            processed = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+            stop = threading.Event()
+            stages = [threading.Thread(target=self._export_decode_stage, args=(cap, decoded, stop, workers),
+                                       daemon=True)]
+            stages += [threading.Thread(target=self._export_effects_stage, args=(decoded, processed, stop),
+                                        daemon=True) for _ in range(workers)]
+            for stage in stages:
+                stage.start()
             
-            # Process all frames
-            for frame_idx in range(self.frame_count):
-                self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = self.video_cap.read()
-                
-                if ret:
-                    processed = self.apply_effects_pipeline(frame)
-                    out.write(processed)
-                
-                # Update progress
-                progress = (frame_idx / self.frame_count) * 100
-                self.root.after(0, lambda p=progress: self.progress_var.set(p))
+            try:
+                self._export_encode_stage(processed, stop, workers, output_path, encoder, quality, fps)
+            finally:
+                stop.set()
+                for stage in stages:
+                    stage.join()
+                cap.release()
             
-            out.release()
             self.root.after(0, lambda: self.export_status_var.set(f"Export complete: {Path(output_path).name}"))
             self.root.after(0, lambda: self.progress_var.set(0))
             
@@ -927,6 +2022,124 @@ class VideoLabPro:
             self.root.after(0, lambda: messagebox.showerror("Export Error", str(e)))
             self.root.after(0, lambda: self.export_status_var.set("Export failed"))
     
+    def _export_decode_stage(self, cap, decoded, stop, workers):
+        """Export stage 1: read (idx, frame) in order, then one None per effects worker
+        
+        A failure is passed on as the exception itself.
+        """
+        idx = 0
+        try:
+            while not stop.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if not self._put_until_stopped(decoded, (idx, frame), stop):
+                    return
+                idx += 1
+        except Exception as e:
+            self._put_until_stopped(decoded, e, stop)
+        for _ in range(workers):
+            self._put_until_stopped(decoded, None, stop)
+    
+    def _export_effects_stage(self, decoded, processed, stop):
+        """Export stage 2 (one of several workers): run the effects pipeline on (idx, frame)
+        
+        End and failure markers are passed along unchanged.
+        """
+        while True:
+            item = self._get_until_stopped(decoded, stop)
+            if item is stop:
+                return
+            if isinstance(item, tuple):
+                idx, frame = item
+                try:
+                    item = (idx, self.apply_effects_pipeline(frame))
+                except Exception as e:
+                    item = e
+            if not self._put_until_stopped(processed, item, stop) or item is None:
+                return
+    
+    def _export_encode_stage(self, processed, stop, workers, output_path, encoder, quality, fps):
+        """Export stage 3: write processed frames in order and report progress"""
+        # The writer is opened on the first frame, whose size already
+        # reflects cropping
+        out = None
+        pending = {}  # idx -> frame finished ahead of an earlier one
+        written = 0
+        finished = 0
+        last_report = 0.0
+        try:
+            while finished < workers:
+                item = self._get_until_stopped(processed, stop)
+                if item is None:
+                    finished += 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                
+                idx, frame = item
+                pending[idx] = frame
+                while written in pending:
+                    frame = pending.pop(written)
+                    if out is None:
+                        out = self._open_video_writer(output_path, encoder, quality, fps, frame.shape)
+                    out.write(frame)
+                    written += 1
+                    
+                    last_report = self._report_progress(written, last_report)
+        except Exception:
+            if out is not None:
+                try:
+                    out.release()  # close the encoder; the original error is the one to report
+                except Exception:
+                    pass
+            raise
+        
+        if out is not None:
+            out.release()
+    
+    def _report_progress(self, done, last_report):
+        """Post export progress unless the last report was under EXPORT_PROGRESS_INTERVAL ago
+        
+        Returns the time of the latest report.
+        """
+        now = time.monotonic()
+        if now - last_report < EXPORT_PROGRESS_INTERVAL:
+            return last_report
+        progress = (done / self.frame_count) * 100
+        self.root.after(0, lambda: self.progress_var.set(progress))
+        return now
+    
+    @staticmethod
+    def _put_until_stopped(q, item, stop):
+        """Put item on q, giving up (returning False) once stop is set"""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    @staticmethod
+    def _get_until_stopped(q, stop):
+        """Next item from q, or stop itself once stop is set"""
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return stop
+    
+    def _open_video_writer(self, output_path, encoder, quality, fps, frame_shape):
+        """ffmpeg pipe writer for encoder, or cv2.VideoWriter when ffmpeg is unavailable"""
+        height, width = frame_shape[:2]
+        if encoder in EXPORT_ENCODERS:
+            return FFmpegWriter(output_path, encoder, quality, fps, width, height)
+        
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        return cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    
     def export_sequence(self):
         """Export as image sequence"""
         if not self.video_cap:
@@ -940,21 +2153,45 @@ class VideoLabPro:
     def _export_sequence_worker(self, output_folder):
         """Export sequence worker thread"""
         try:
+            # Read sequentially from a capture of our own; seeking to every
+            # frame restarts decoding from the previous keyframe each time
+            cap = cv2.VideoCapture(self.video_path)
+            if not cap.isOpened():
+                raise RuntimeError(f"Cannot reopen {self.video_path}")
+            
             self.root.after(0, lambda: self.export_status_var.set("Exporting sequence..."))
             
-            for frame_idx in range(self.frame_count):
-                self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = self.video_cap.read()
-                
-                if ret:
-                    processed = self.apply_effects_pipeline(frame)
-                    filename = f"frame_{frame_idx:06d}.png"
-                    filepath = os.path.join(output_folder, filename)
-                    cv2.imwrite(filepath, processed)
-                
-                # Update progress
-                progress = (frame_idx / self.frame_count) * 100
-                self.root.after(0, lambda p=progress: self.progress_var.set(p))
+            # PNG encoding runs on a pool while this thread decodes and
+            # processes the next frames; the semaphore caps frames in flight
+            in_flight = threading.BoundedSemaphore(SEQUENCE_WRITES_IN_FLIGHT)
+            errors = []
+            last_report = 0.0
+            
+            def write_done(future):
+                if future.exception() is not None:
+                    errors.append(future.exception())
+                in_flight.release()
+            
+            try:
+                with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+                    for frame_idx in range(self.frame_count):
+                        ret, frame = cap.read()
+                        if not ret:
+                            break
+                        
+                        processed = self.apply_effects_pipeline(frame)
+                        filename = f"frame_{frame_idx:06d}.png"
+                        filepath = os.path.join(output_folder, filename)
+                        in_flight.acquire()
+                        if errors:
+                            break
+                        pool.submit(write_png, filepath, processed).add_done_callback(write_done)
+                        last_report = self._report_progress(frame_idx + 1, last_report)
+            finally:
+                cap.release()
+            
+            if errors:
+                raise errors[0]
             
             self.root.after(0, lambda: self.export_status_var.set("Sequence export complete"))
             self.root.after(0, lambda: self.progress_var.set(0))
@@ -978,7 +2215,7 @@ class VideoLabPro:
                     'effects_pipeline': self.effects_pipeline,
                     'overlay_params': self.overlay_params,
                     'crop_params': self.crop_params,
-                    'markers': self.markers,
+                    'markers': [{'frame': frame, 'name': name} for frame, name in self.markers],
                     'parameters': {
                         'canny_low': self.canny_low.get(),
                         'canny_high': self.canny_high.get(),
@@ -1016,7 +2253,7 @@ class VideoLabPro:
                 self.effects_pipeline = project_data.get('effects_pipeline', [])
                 self.overlay_params = project_data.get('overlay_params', self.overlay_params)
                 self.crop_params = project_data.get('crop_params', self.crop_params)
-                self.markers = project_data.get('markers', [])
+                self.markers = sorted((m['frame'], m['name']) for m in project_data.get('markers', []))
                 
                 # Restore parameters
                 params = project_data.get('parameters', {})
@@ -1030,9 +2267,10 @@ class VideoLabPro:
                 self.text_size.set(params.get('text_size', 30))
                 
                 # Update UI
+                self._compile_pipeline()
                 self.update_effects_list()
                 self.update_markers_list()
-                self.update_preview()
+                self._sync_params()
                 
                 self.project_path = file_path
                 self.status_var.set(f"Project loaded: {Path(file_path).name}")